@@ -1,14 +1,20 @@
+import math
+import numpy as np
 import yaml
-import networkx as nx
 import matplotlib.pyplot as plt
 import time
 import os
 from pathlib import Path
+from csr_graph import edges_to_csr, dijkstra_csr
+
+# Use the C-backed libyaml loader when it is available; same documents, several
+# times faster than the pure-Python SafeLoader
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 def load_network_from_yaml(file_path):
     with open(file_path, 'r') as file:
-        data = yaml.safe_load(file)
-    
+        data = yaml.load(file, Loader=_Loader)
+
     nodes = [str(node) for node in data['nodes']]
     edges = [(str(edge['source']), str(edge['destination']), {
         'bandwidth': edge['bandwidth'],
@@ -36,91 +42,91 @@ def load_network_from_yaml(file_path):
     
     return nodes, edges, compute_nodes, compute_capacities, source_node, destination_node, flow_size, gamma, omega
 
-def find_max_capacity_compute_node(G, source_node, destination_node, compute_nodes, compute_capacities, flow_size, omega, gamma):
-    # Find compute node with maximum capacity
-    max_capacity_node = max(compute_capacities.items(), key=lambda x: x[1])[0]
-    
-    try:
-        # Use Dijkstra's algorithm to find shortest path from source to compute node
-        path_to_compute = nx.shortest_path(G, source_node, max_capacity_node, weight=lambda u, v, d: (
-            d['propagation_delay'] + 
-            d['processing_delay'] + 
-            d['queuing_delay'] + 
-            flow_size / d['bandwidth'] + 
-            d['jitter']
-        ))
-        
-        # Use Dijkstra's algorithm to find shortest path from compute node to destination
-        path_to_dest = nx.shortest_path(G, max_capacity_node, destination_node, weight=lambda u, v, d: (
-            d['propagation_delay'] + 
-            d['processing_delay'] + 
-            d['queuing_delay'] + 
-            gamma * flow_size / d['bandwidth'] + 
-            d['jitter']
-        ))
-        
-        # Calculate total delay from source to compute node
-        delay_to_compute = sum(
-            G[path_to_compute[i]][path_to_compute[i+1]]['propagation_delay'] +
-            G[path_to_compute[i]][path_to_compute[i+1]]['processing_delay'] +
-            G[path_to_compute[i]][path_to_compute[i+1]]['queuing_delay'] +
-            flow_size / G[path_to_compute[i]][path_to_compute[i+1]]['bandwidth'] +
-            G[path_to_compute[i]][path_to_compute[i+1]]['jitter']
-            for i in range(len(path_to_compute)-1))
-        
-        # Calculate delay from compute node to destination
-        delay_to_dest = sum(
-            G[path_to_dest[i]][path_to_dest[i+1]]['propagation_delay'] +
-            G[path_to_dest[i]][path_to_dest[i+1]]['processing_delay'] +
-            G[path_to_dest[i]][path_to_dest[i+1]]['queuing_delay'] +
-            gamma * flow_size / G[path_to_dest[i]][path_to_dest[i+1]]['bandwidth'] +
-            G[path_to_dest[i]][path_to_dest[i+1]]['jitter']
-            for i in range(len(path_to_dest)-1))
-        
-        # Calculate processing delay at compute node
-        compute_delay = omega * flow_size / compute_capacities[max_capacity_node]
-        
-        # Calculate total delay
-        total_delay = delay_to_compute + delay_to_dest + compute_delay
-        
-        # Build complete path
-        full_path = path_to_compute[:-1] + path_to_dest
-        
-        return max_capacity_node, total_delay, full_path
-        
-    except nx.NetworkXNoPath:
+def find_max_capacity_compute_node(csr, source_node, destination_node, compute_node_ids, capacities_arr, flow_size, omega, gamma):
+    node_ids, node_to_idx, indptr, indices, w_fwd, w_rev = csr
+
+    # Find compute node with maximum capacity; a C-level argmax over the
+    # aligned capacity array instead of a Python max over dict items
+    max_idx = int(capacities_arr.argmax())
+    max_capacity_node = compute_node_ids[max_idx]
+
+    src = node_to_idx[source_node]
+    mid = node_to_idx[max_capacity_node]
+    dst = node_to_idx[destination_node]
+
+    # Both legs run through the JIT-compiled CSR Dijkstra kernel, which works
+    # on flat arrays instead of walking the NetworkX dict-of-dicts per edge.
+    # The returned length is the leg delay, so there is no second walk over
+    # the path
+    delay_to_compute, path_fwd = dijkstra_csr(indptr, indices, w_fwd, src, mid)
+    delay_to_dest, path_rev = dijkstra_csr(indptr, indices, w_rev, mid, dst)
+    if math.isinf(delay_to_compute) or math.isinf(delay_to_dest):
         return None, float('inf'), []
 
-def main():
-    # Get current file directory
-    CURRENT_DIR = os.path.dirname(__file__)
-    yaml_file_path = os.path.join(CURRENT_DIR, "random_network.yaml")
+    # Calculate processing delay at compute node
+    compute_delay = omega * flow_size / capacities_arr[max_idx]
 
-    nodes, edges, compute_nodes, compute_capacities, source_node, destination_node, flow_size, gamma,omega = load_network_from_yaml(yaml_file_path)
+    # Calculate total delay
+    total_delay = delay_to_compute + delay_to_dest + compute_delay
+
+    # Build complete path
+    full_path = [node_ids[i] for i in path_fwd[:-1]] + [node_ids[i] for i in path_rev]
+
+    return max_capacity_node, total_delay, full_path
+
+# Get current file directory
+CURRENT_DIR = os.path.dirname(__file__)
+DEFAULT_YAML_PATH = os.path.join(CURRENT_DIR, "random_network.yaml")
+
+def run(yaml_file_path=None, network=None):
+    """Run the MPCN algorithm on the given network file and return its metrics.
+
+    When the caller has already parsed the file, the tuple returned by
+    load_network_from_yaml can be passed as ``network`` to skip re-parsing.
+    """
+    if yaml_file_path is None:
+        yaml_file_path = DEFAULT_YAML_PATH
+    if network is None:
+        network = load_network_from_yaml(yaml_file_path)
+
+    nodes, edges, compute_nodes, compute_capacities, source_node, destination_node, flow_size, gamma,omega = network
+
+    # Go straight from the parsed edge list to CSR arrays; no intermediate
+    # NetworkX graph with one attribute dict per edge
+    csr = edges_to_csr(nodes, edges, flow_size, gamma)
+
+    # Keep the capacities as an array aligned with the compute node list so
+    # the selection below is a single vectorized reduction
+    compute_node_ids = list(compute_capacities)
+    capacities_arr = np.fromiter(compute_capacities.values(), dtype=np.float64,
+                                 count=len(compute_capacities))
 
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
-    
     # Start time
     the_closest_start_time = time.time()
-    
-    closest_node, total_delay, full_path = find_max_capacity_compute_node(G, source_node, destination_node, compute_nodes, compute_capacities, flow_size, omega, gamma)
-    
+
+    closest_node, total_delay, full_path = find_max_capacity_compute_node(csr, source_node, destination_node, compute_node_ids, capacities_arr, flow_size, omega, gamma)
+
     # End time
     the_closest_end_time = time.time()
-    
-    if closest_node:
-        print(f"Closest compute node: {closest_node}")
-        print(f"Shortest path: {' -> '.join(full_path)}")
+
+    return {
+        'Closest_compute_node': closest_node,
+        'Shortest_path': full_path,
+        'END_TO_END_DELAY': total_delay,
+        'RUNNING_TIME': the_closest_end_time - the_closest_start_time,
+    }
+
+def main():
+    metrics = run()
+
+    if metrics['Closest_compute_node']:
+        print(f"Closest compute node: {metrics['Closest_compute_node']}")
+        print(f"Shortest path: {' -> '.join(metrics['Shortest_path'])}")
     else:
         print("No reachable compute node found")
-    
-    end_to_end_delay = total_delay
-    running_time = the_closest_end_time - the_closest_start_time
 
-    print(f"END_TO_END_DELAY:{end_to_end_delay}")
-    print(f"RUNNING_TIME:{running_time}")
+    print(f"END_TO_END_DELAY:{metrics['END_TO_END_DELAY']}")
+    print(f"RUNNING_TIME:{metrics['RUNNING_TIME']}")
 
 if __name__ == "__main__":
     main()
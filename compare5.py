@@ -4,15 +4,15 @@
     Range of edges: [5000,50000].
 '''
 import csv
-import time
-import subprocess
-import sys
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from network_parameters import generate_network_parameters
+from network_io import load_network_from_yaml
 import statistics
 import os
 import shutil
 from pathlib import Path
-    
+
 def generate_network_parameters_with_scale(nodes, edges):
     yaml_file_path = generate_network_parameters(nodes, edges)
     yaml_copy_path = f'network_parameters_n{nodes}_e{edges}.yaml'
@@ -20,39 +20,29 @@ def generate_network_parameters_with_scale(nodes, edges):
     os.remove(yaml_file_path)
     return yaml_copy_path
 
-def run_script(script_path, yaml_file_path):
-    start_time = time.time()
-    result = subprocess.run([sys.executable, script_path, yaml_file_path], capture_output=True, text=True)
-    end_time = time.time()
-    return result.stdout, end_time - start_time
+def load_algorithm(name, script_path):
+    # Import each algorithm once and call its run() in-process, instead of
+    # paying interpreter startup and re-imports in a subprocess per invocation.
+    # The scripts are loaded by file path because "CPEG algorithm.py" is not a
+    # valid module name
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run
 
-def parse_output(output):
-    delay = None
-    running_time = None
-    
-    for line in output.split('\n'):
-        if line.startswith("END_TO_END_DELAY:"):
-            try:
-                delay = float(line.split(":")[-1].strip())
-            except ValueError:
-                print(f"Unable to parse end-to-end delay: {line}")
-        
-        if line.startswith("RUNNING_TIME:"):
-            try:
-                running_time = float(line.split(":")[-1].strip())
-            except ValueError:
-                print(f"Unable to parse running time: {line}")
-    
-    if delay is None:
-        print("End-to-end delay not found")
-    if running_time is None:
-        print("Running time not found")
-    
-    if delay is None or running_time is None:
-        print("Complete output:")
-        print(output)
-    
-    return delay, running_time
+# Per-worker cache of loaded algorithm modules; each pool worker imports an
+# algorithm at most once across all the tasks it executes
+_worker_runs = {}
+
+def run_one(name, script_path, yaml_file_path):
+    run_algorithm = _worker_runs.get(name)
+    if run_algorithm is None:
+        run_algorithm = _worker_runs[name] = load_algorithm(name, script_path)
+    # The first worker to touch a file parses it and leaves a .pkl sidecar
+    # behind, so the other workers load the pickle instead of re-parsing
+    network = load_network_from_yaml(yaml_file_path)
+    metrics = run_algorithm(yaml_file_path, network=network)
+    return metrics
 
 def save_detailed_results_to_csv(results, filename='detailed_results.csv'):
     with open(filename, 'w', newline='') as csvfile:
@@ -131,28 +121,35 @@ def main():
 
     results = {name: {scale: {"run_times": [], "delays": []} for scale in network_scales} for name in algorithms}
 
-    for nodes, edges in network_scales:
-        print(f"\nTesting network scale: Nodes {nodes}, Edges {edges}")
-        
-        yaml_file_path = generate_network_parameters(nodes, edges)
-        
-        for i in range(num_runs):
-            print(f"   Executing test {i+1}...")
-            
-            for name, path in algorithms.items():
-                print(f"     Running {name} algorithm...")
+    # Every (run, algorithm) pair is independent, so fan the whole scale out
+    # over a persistent worker pool instead of executing the pairs serially
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for nodes, edges in network_scales:
+            print(f"\nTesting network scale: Nodes {nodes}, Edges {edges}")
+
+            yaml_file_path = generate_network_parameters(nodes, edges)
+            yaml_copy_path = f'network_parameters_n{nodes}_e{edges}.yaml'
+            shutil.copy2(yaml_file_path, yaml_copy_path)
+
+            futures = {}
+            for i in range(num_runs):
+                for name, path in algorithms.items():
+                    future = executor.submit(run_one, name, path, yaml_copy_path)
+                    futures[future] = name
+
+            for future in as_completed(futures):
+                name = futures[future]
                 try:
-                    output, _ = run_script(path, yaml_file_path)
-                    delay, running_time = parse_output(output)
-                    if delay is not None and running_time is not None:
-                        results[name][(nodes, edges)]["run_times"].append(running_time)
-                        results[name][(nodes, edges)]["delays"].append(delay)
-                    else:
-                        print(f"      {name} algorithm did not return valid delay or running time")
+                    metrics = future.result()
+                    results[name][(nodes, edges)]["run_times"].append(metrics['RUNNING_TIME'])
+                    results[name][(nodes, edges)]["delays"].append(metrics['END_TO_END_DELAY'])
                 except Exception as e:
                     print(f"      {name} algorithm failed: {str(e)}")
-        
-        os.remove(yaml_file_path)
+
+            os.remove(yaml_file_path)
+            for path in (yaml_copy_path, yaml_copy_path + '.pkl', yaml_copy_path + '.expanded.pkl'):
+                if os.path.exists(path):
+                    os.remove(path)
 
     print("\nFinal comparison results:")
     for name in algorithms:
